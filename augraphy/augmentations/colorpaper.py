@@ -30,6 +30,38 @@ class ColorPaper(Augmentation):
     def __repr__(self):
         return f"ColorPaper(hue_range={self.hue_range}, saturation_range={self.saturation_range}, p={self.p})"
 
+    def add_color_hsv(self, image_value):
+        """Add color into a single channel value plane by assigning random hue and saturation to it.
+
+        :param image_value: The value (brightness) channel of the image.
+        :type image_value: numpy.array (numpy.uint8)
+        """
+
+        ysize, xsize = image_value.shape[:2]
+
+        random_hue = np.random.randint(self.hue_range[0], self.hue_range[1] + 1)
+        random_saturation = np.random.randint(self.saturation_range[0], self.saturation_range[1] + 1)
+
+        # assign hue and saturation
+        image_h = np.random.randint(
+            max(0, random_hue - 5),
+            min(255, random_hue + 5),
+            size=(ysize, xsize),
+            dtype="uint8",
+        )
+        image_s = np.random.randint(
+            max(0, random_saturation - 5),
+            min(255, random_saturation + 5),
+            size=(ysize, xsize),
+            dtype="uint8",
+        )
+
+        # merge hue, saturation and value channel and convert to bgr
+        image_hsv = cv2.merge([image_h, image_s, image_value])
+        image_color = cv2.cvtColor(image_hsv, cv2.COLOR_HSV2BGR)
+
+        return image_color
+
     def add_color(self, image):
         """Add color background into input image.
 
@@ -43,28 +75,14 @@ class ColorPaper(Augmentation):
             if image.shape[2] == 4:
                 has_alpha = 1
                 image, image_alpha = image[:, :, :3], image[:, :, 3]
+            # get value channel from hsv colorspace
+            image_value = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)[:, :, 2]
         else:
             is_gray = 1
-            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
-
-        ysize, xsize = image.shape[:2]
-
-        # convert to hsv colorspace
-        image_hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-
-        random_hue = np.random.randint(self.hue_range[0], self.hue_range[1] + 1)
-        random_saturation = np.random.randint(self.saturation_range[0], self.saturation_range[1] + 1)
-
-        # assign hue and saturation
-        image_h = np.random.randint(max(0, random_hue - 5), min(255, random_hue + 5), size=(ysize, xsize))
-        image_s = np.random.randint(max(0, random_saturation - 5), min(255, random_saturation + 5), size=(ysize, xsize))
+            # value channel of gray image is the image itself
+            image_value = image
 
-        # assign hue and saturation channel back to hsv image
-        image_hsv[:, :, 0] = image_h
-        image_hsv[:, :, 1] = image_s
-
-        # convert back to bgr
-        image_color = cv2.cvtColor(image_hsv, cv2.COLOR_HSV2BGR)
+        image_color = self.add_color_hsv(image_value)
 
         # return image follows the input image color channel
         if is_gray:
@@ -8,7 +8,6 @@ import numba as nb
 import numpy as np
 from numba import config
 from numba import jit
-from numpy.linalg import norm
 from PIL import Image
 from skimage.filters import threshold_li
 from skimage.filters import threshold_local
@@ -235,10 +234,16 @@ def generate_average_intensity(image):
     # https://stackoverflow.com/questions/14243472/estimate-brightness-of-an-image-opencv/22020098#22020098
     if len(image.shape) > 2:
         # bgr image - create brightness with euclidean norm
-        return np.average(norm(image, axis=2)) / np.sqrt(3)
+        image_float = image.astype("float32")
+        # sum of squared channels per pixel
+        image_squared_sum = cv2.transform(
+            cv2.multiply(image_float, image_float),
+            np.ones((1, image.shape[2]), dtype="float32"),
+        )
+        return cv2.mean(cv2.sqrt(image_squared_sum))[0] / np.sqrt(3)
     else:
-        # grayscale or binary
-        return np.average(image)
+        # grayscale or binary, cv2.mean is faster than np.average on uint8 image
+        return cv2.mean(image)[0]
 
 
 # for lens flare
@@ -1,9 +1,13 @@
 import glob
 import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import cv2
 import numpy as np
+from numba import jit
+from PIL import Image
 
 from augraphy.augmentations.brightness import Brightness
 from augraphy.augmentations.colorpaper import ColorPaper
@@ -12,6 +16,99 @@ from augraphy.base.augmentation import Augmentation
 from augraphy.utilities.overlaybuilder import OverlayBuilder
 from augraphy.utilities.texturegenerator import TextureGenerator
 
+# maximum number of decoded paper textures kept in memory
+TEXTURE_CACHE_SIZE = 32
+
+# textures with shorter side below this size are too small to be used as paper
+TEXTURE_MIN_SIZE = 32
+
+# types of background texture for texture generation
+TEXTURE_TYPES = (
+    "normal",
+    "strange",
+    "rough_stains",
+    "fine_stains",
+    "severe_stains",
+    "light_stains",
+    "random_pattern",
+    "dot_granular",
+    "light_granular",
+    "rough_granular",
+)
+
+# types of edge texture for texture generation
+EDGE_TYPES = ("curvy_edge", "broken_edge")
+
+# methods to blend textures
+BLEND_METHODS = (
+    "ink_to_paper",
+    "min",
+    "max",
+    "mix",
+    "normal",
+    "lighten",
+    "darken",
+    "screen",
+    "dodge",
+    "multiply",
+    "divide",
+    "grain_merge",
+    "overlay",
+    "FFT",
+)
+
+# rectangular erode kernels to check paper edges in full resolution and downsampled texture
+EDGE_ERODE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
+EDGE_ERODE_KERNEL_DOWNSAMPLED = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+# sides to crop from generated texture (top, bottom, left, right) and the remaining sides after each one is cropped
+CROP_SIDES = (0, 1, 2, 3)
+CROP_REMAINING_SIDES = ((1, 2, 3), (0, 2, 3), (0, 1, 3), (0, 1, 2))
+
+
+def probe_paper_texture(file):
+    """Read the header of a texture file and return its size and mode.
+    Files Pillow can't open, such as HDR images or very large scans, are decoded with OpenCV instead.
+    Returns None if the file is not a valid image or it is too small.
+
+    :param file: Path to the texture file.
+    :type file: string
+    """
+
+    try:
+        with Image.open(file) as image:
+            size, mode = image.size, image.mode
+    except (OSError, Image.DecompressionBombError):
+        texture = read_paper_texture(file)
+        if texture is None:
+            return None
+        size, mode = (texture.shape[1], texture.shape[0]), "BGR"
+
+    if min(size) < TEXTURE_MIN_SIZE:
+        return None
+
+    return size, mode
+
+
+@lru_cache(maxsize=TEXTURE_CACHE_SIZE)
+def read_paper_texture(file):
+    """Decode a texture file into a 3 channels 8-bit BGR image.
+    Returns None if the file can't be decoded.
+    Decoded textures are memoized, so each texture is only decoded once.
+
+    :param file: Path to the texture file.
+    :type file: string
+    """
+
+    # the default flag converts grayscale, alpha and 16-bit images into 8-bit BGR
+    texture = cv2.imread(file)
+
+    # prevent invalid image file
+    if not hasattr(texture, "dtype") or texture.dtype != np.uint8:
+        return None
+
+    return texture
+
 
 class PaperFactory(Augmentation):
     """Replaces the starting paper image with a texture randomly chosen from
@@ -102,47 +199,46 @@ class PaperFactory(Augmentation):
         self.blend_texture_edge_type = blend_texture_edge_type
         self.blend_method = blend_method
         self.texture_file_names = []
-        self.paper_textures = list()
+        self.paper_texture_files = list()
         self.blend_texture_file_names = []
-        self.blend_paper_textures = list()
+        self.blend_paper_texture_files = list()
+        self.texture_generator = TextureGenerator()
 
         # read texture from directory if texture genetation is disabled
         if not self.generate_texture:
-            for file in glob.glob(f"{texture_path}/*"):
-                texture = cv2.imread(file)
-                self.texture_file_names.append(os.path.basename(file))
-                # prevent invalid image file
-                if hasattr(texture, "dtype") and texture.dtype == np.uint8:
-
-                    if len(texture.shape) > 2 and texture.shape[2] == 4:
-                        texture = cv2.cvtColor(texture, cv2.COLOR_BGRA2BGR)
-                    elif len(texture.shape) > 2 and texture.shape[2] == 3:
-                        pass
-                    else:
-                        texture = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
-
-                    self.paper_textures.append(cv2.imread(file))
+            self.load_textures(texture_path, self.texture_file_names, self.paper_texture_files)
 
         if self.blend_texture and not self.blend_generate_texture:
-            for file in glob.glob(f"{blend_texture_path}/*"):
-                texture = cv2.imread(file)
-                self.blend_texture_file_names.append(os.path.basename(file))
-                # prevent invalid image file
-                if hasattr(texture, "dtype") and texture.dtype == np.uint8:
-
-                    if len(texture.shape) > 2 and texture.shape[2] == 4:
-                        texture = cv2.cvtColor(texture, cv2.COLOR_BGRA2BGR)
-                    elif len(texture.shape) > 2 and texture.shape[2] == 3:
-                        pass
-                    else:
-                        texture = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
-
-                    self.blend_paper_textures.append(cv2.imread(file))
+            self.load_textures(blend_texture_path, self.blend_texture_file_names, self.blend_paper_texture_files)
 
     # Constructs a string representation of this Augmentation.
     def __repr__(self):
         return f"PaperFactory(texture_path={self.texture_path},generate_texture={self.generate_texture},generate_texture_background_type={self.generate_texture_background_type},generate_texture_edge_type={self.generate_texture_edge_type},texture_enable_color={self.texture_enable_color},texture_color={self.texture_color},texture_color_blend_method={self.texture_color_blend_method},blend_texture={self.blend_texture}, blend_texture_path={self.blend_texture_path},blend_generate_texture={self.blend_generate_texture},blend_texture_background_type={self.blend_texture_background_type}, blend_texture_edge_type={self.blend_texture_edge_type}, blend_method={self.blend_method}, p={self.p})"
 
+    def load_textures(self, texture_path, texture_file_names, paper_texture_files):
+        """Collect the valid textures in a directory without decoding them.
+        Only the image headers are read here, the textures are decoded on first use.
+
+        :param texture_path: Directory location to pull paper textures from.
+        :type texture_path: string
+        :param texture_file_names: List to store the file name of each valid texture.
+        :type texture_file_names: list
+        :param paper_texture_files: List to store the path of each valid texture.
+        :type paper_texture_files: list
+        """
+
+        files = glob.glob(f"{texture_path}/*")
+
+        # header probing is I/O bound, so threads scale with the available cores
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            texture_headers = list(executor.map(probe_paper_texture, files))
+
+        for file, texture_header in zip(files, texture_headers):
+            # prevent invalid or tiny image file
+            if texture_header is not None:
+                texture_file_names.append(os.path.basename(file))
+                paper_texture_files.append(file)
+
     def retrieve_texture(self, image, fblend):
         """Retrieve image texture from the input texture path.
 
@@ -151,12 +247,28 @@ class PaperFactory(Augmentation):
         """
         shape = image.shape
         if fblend:
-            paper_textures = self.blend_paper_textures
+            texture_file_names = self.blend_texture_file_names
+            paper_texture_files = self.blend_paper_texture_files
         else:
-            paper_textures = self.paper_textures
-        random_index = random.randint(0, len(paper_textures) - 1)
-        texture = paper_textures[random_index]
-        texture = np.rot90(texture, random.randint(1, 4))
+            texture_file_names = self.texture_file_names
+            paper_texture_files = self.paper_texture_files
+
+        # drop files which can't be decoded and generate texture if none of them is valid
+        texture_cached = None
+        while texture_cached is None:
+            if len(paper_texture_files) == 0:
+                return self.generate_random_texture(image, fblend)
+            random_index = random.randint(0, len(paper_texture_files) - 1)
+            texture_cached = read_paper_texture(paper_texture_files[random_index])
+            if texture_cached is None:
+                del texture_file_names[random_index]
+                del paper_texture_files[random_index]
+        texture = texture_cached
+
+        # rotate texture randomly by 0, 90, 180 or 270 degrees
+        rotate_code = random.choice((None, cv2.ROTATE_90_COUNTERCLOCKWISE, cv2.ROTATE_180, cv2.ROTATE_90_CLOCKWISE))
+        if rotate_code is not None:
+            texture = cv2.rotate(texture, rotate_code)
 
         # check for edge
         texture = self.check_paper_edges(texture)
@@ -175,6 +287,12 @@ class PaperFactory(Augmentation):
         else:
             texture = self.resize(texture, shape)
 
+        # copy if the texture is still a view of the memoized texture, so that changes to it do not corrupt the cache
+        if np.may_share_memory(texture, texture_cached):
+            texture = texture.copy()
+        else:
+            texture = np.ascontiguousarray(texture)
+
         return texture
 
     def generate_random_texture(self, image, fblend):
@@ -186,34 +304,19 @@ class PaperFactory(Augmentation):
         :type fblend: int
         """
 
-        texture_generator = TextureGenerator()
-
         ysize, xsize = image.shape[:2]
 
         # secondary feature for blending
         if fblend:
             # randomize background texture type
             if self.blend_texture_background_type == "random":
-                texture_type = random.choice(
-                    [
-                        "normal",
-                        "strange",
-                        "rough_stains",
-                        "fine_stains",
-                        "severe_stains",
-                        "light_stains",
-                        "random_pattern",
-                        "dot_granular",
-                        "light_granular",
-                        "rough_granular",
-                    ],
-                )
+                texture_type = random.choice(TEXTURE_TYPES)
             else:
                 texture_type = self.blend_texture_background_type
 
             # randomize edge texture type
             if self.blend_texture_edge_type == "random":
-                edge_type = random.choice(["curvy_edge", "broken_edge"])
+                edge_type = random.choice(EDGE_TYPES)
             else:
                 edge_type = self.blend_texture_edge_type
 
@@ -221,31 +324,18 @@ class PaperFactory(Augmentation):
         else:
             # randomize background texture type
             if self.generate_texture_background_type == "random":
-                texture_type = random.choice(
-                    [
-                        "normal",
-                        "strange",
-                        "rough_stains",
-                        "fine_stains",
-                        "severe_stains",
-                        "light_stains",
-                        "random_pattern",
-                        "dot_granular",
-                        "light_granular",
-                        "rough_granular",
-                    ],
-                )
+                texture_type = random.choice(TEXTURE_TYPES)
             else:
                 texture_type = self.generate_texture_background_type
 
             # randomize edge texture type
             if self.generate_texture_edge_type == "random":
-                edge_type = random.choice(["curvy_edge", "broken_edge"])
+                edge_type = random.choice(EDGE_TYPES)
             else:
                 edge_type = self.generate_texture_edge_type
 
         # generate background texture
-        texture = texture_generator(
+        texture = self.texture_generator(
             texture_type=texture_type,
             texture_width=xsize,
             texture_height=ysize,
@@ -253,57 +343,86 @@ class PaperFactory(Augmentation):
         )
 
         # generate edge texture
-        texture_edge = texture_generator(
+        texture_edge = self.texture_generator(
             texture_type=edge_type,
             texture_width=xsize,
             texture_height=ysize,
             quilt_texture=0,
         )
-        if edge_type == "curvy_edge":
-            # blend edge into texture
-            texture = cv2.multiply(texture, texture_edge, scale=1 / 255)
-        else:
-            # remove area outside edge texture
-            texture[texture_edge <= 0] = 0
 
         # randomly crop 1 or 2 side of edge
         crop_x = int(xsize / 20)
         crop_y = int(ysize / 20)
+        y_top, y_bottom, x_left, x_right = 0, ysize, 0, xsize
         if random.randint(0, 1):
-            selections = [0, 1, 2, 3]
-            selection1 = random.choice(selections)
-            # remove top
-            if selection1 == 0:
-                texture = texture[crop_y:, :]
-            # remove bottom
-            elif selection1 == 1:
-                texture = texture[: ysize - crop_y, :]
-            # removeleft
-            elif selection1 == 2:
-                texture = texture[:, crop_x:]
-            # remove right
-            elif selection1 == 3:
-                texture = texture[:, : xsize - crop_x]
-
+            selected_sides = [random.choice(CROP_SIDES)]
             if random.randint(0, 1):
-                # crop a second time
-                selections.remove(selection1)
-                selection2 = random.choice(selections)
+                # crop a second time from the remaining sides
+                selected_sides.append(random.choice(CROP_REMAINING_SIDES[selected_sides[0]]))
+
+            for selection in selected_sides:
                 # remove top
-                if selection2 == 0:
-                    texture = texture[crop_y:, :]
+                if selection == 0:
+                    y_top = crop_y
                 # remove bottom
-                elif selection2 == 1:
-                    texture = texture[: ysize - crop_y, :]
+                elif selection == 1:
+                    y_bottom = ysize - crop_y
                 # removeleft
-                elif selection2 == 2:
-                    texture = texture[:, crop_x:]
+                elif selection == 2:
+                    x_left = crop_x
                 # remove right
-                elif selection2 == 3:
-                    texture = texture[:, : xsize - crop_x]
+                elif selection == 3:
+                    x_right = xsize - crop_x
+
+        # apply edge texture and crop in a single pass
+        texture = self.apply_edge_texture(
+            texture,
+            texture_edge,
+            edge_type == "curvy_edge",
+            y_top,
+            y_bottom,
+            x_left,
+            x_right,
+        )
 
         return texture
 
+    @staticmethod
+    @jit(nopython=True, cache=True)
+    def apply_edge_texture(texture, texture_edge, blend_edge, y_top, y_bottom, x_left, x_right):
+        """Apply edge texture into the texture and crop it to the input boundaries.
+
+        :param texture: The background texture.
+        :type texture: numpy array
+        :param texture_edge: The edge texture.
+        :type texture_edge: numpy array
+        :param blend_edge: Flag to blend edge into texture, else area outside edge texture is removed.
+        :type blend_edge: bool
+        :param y_top: The top boundary of the crop.
+        :type y_top: int
+        :param y_bottom: The bottom boundary of the crop.
+        :type y_bottom: int
+        :param x_left: The left boundary of the crop.
+        :type x_left: int
+        :param x_right: The right boundary of the crop.
+        :type x_right: int
+        """
+
+        texture_output = np.empty((y_bottom - y_top, x_right - x_left), dtype=np.uint8)
+        for y in range(y_bottom - y_top):
+            for x in range(x_right - x_left):
+                value = texture[y + y_top, x + x_left]
+                edge = texture_edge[y + y_top, x + x_left]
+                if blend_edge:
+                    # rounded value * edge / 255
+                    texture_output[y, x] = (np.uint32(value) * edge + 127) // 255
+                elif edge <= 0:
+                    texture_output[y, x] = 0
+                else:
+                    texture_output[y, x] = value
+
+        return texture_output
+
     def check_paper_edges(self, texture):
         """Crop image section with better texture.
 
@@ -319,75 +438,71 @@ class PaperFactory(Augmentation):
         else:
             texture_gray = texture.copy()
 
+        # the binary operations only need a rough location of the paper, so run them on a downsampled image
+        scale = 4 if min(ysize, xsize) >= 128 else 1
+        if scale > 1:
+            texture_gray = cv2.resize(texture_gray, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA)
+        small_ysize, small_xsize = texture_gray.shape[:2]
+
         # blur image
         texture_blur = cv2.GaussianBlur(texture_gray, (5, 5), 0)
 
         # convert to binary using otsu
         _, texture_binary = cv2.threshold(texture_gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-        # get border average intensity
+        # get border average intensity from the sum of each border strip in the integral image
+        texture_integral = cv2.integral(texture_binary)
+        border_size = min(10 // scale, small_ysize, small_xsize)
+        total_sum = texture_integral[small_ysize, small_xsize]
+        left_sum = texture_integral[small_ysize, border_size]
+        right_sum = total_sum - texture_integral[small_ysize, small_xsize - border_size]
+        top_sum = texture_integral[border_size, small_xsize]
+        bottom_sum = total_sum - texture_integral[small_ysize - border_size, small_xsize]
         border_average = (
-            np.average(texture_binary[:, :10])
-            + np.average(texture_binary[:, -10:])
-            + np.average(texture_binary[:10, :])
-            + np.average(texture_binary[-10:, :])
+            (left_sum + right_sum) / (small_ysize * border_size) + (top_sum + bottom_sum) / (small_xsize * border_size)
         ) / 4
 
         # get center average intensity
-        center_x = int(xsize / 2)
-        center_y = int(ysize / 2)
-        center_average = np.average(texture_blur[center_y - 10 : center_y + 10, center_x - 10 : center_x + 10])
+        center_x = int(small_xsize / 2)
+        center_y = int(small_ysize / 2)
+        offset = 10 // scale
+        center_average = cv2.mean(
+            texture_blur[center_y - offset : center_y + offset, center_x - offset : center_x + offset]
+        )[0]
 
         # if border intensity is higher, complement image
         if border_average > center_average:
             texture_binary = 255 - texture_binary
 
-        # erode
-        texture_binary = cv2.erode(texture_binary, np.ones((9, 9), np.uint8), iterations=1)
+        # erode, kernel size follows the downsampling
+        erode_kernel = EDGE_ERODE_KERNEL if scale == 1 else EDGE_ERODE_KERNEL_DOWNSAMPLED
+        texture_binary = cv2.erode(texture_binary, erode_kernel, iterations=1)
 
-        # find contours in image
-        contours, hierarchy = cv2.findContours(texture_binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        # get area of all bright regions
+        n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(texture_binary, connectivity=8)
 
-        # get all areas
-        areas = [cv2.contourArea(contour) for contour in contours]
+        # threshold for region area
+        min_area = small_ysize * small_xsize * 0.65
 
-        # sort area and get the largest contour first
-        area_indexs = list(np.argsort(areas))
-        area_indexs.reverse()
+        # at least 1 region, label 0 is the background
+        if n_labels > 1:
+            max_label = np.argmax(stats[1:, cv2.CC_STAT_AREA]) + 1
 
-        # threshold for contour
-        min_area = ysize * xsize * 0.65
-
-        # at least 1 contour
-        if len(areas) > 0:
-            max_contour = contours[area_indexs[0]]
-            for i, area_index in enumerate(area_indexs):
-                # last index
-                if i == len(area_indexs) - 1:
-                    # current contour >= min area
-                    if areas[area_indexs[i]] >= min_area:
-                        max_contour = contours[area_index]
-                    else:
-                        return texture
-                else:
-                    # current contour >= min area but the next one < min area
-                    if areas[area_indexs[i]] >= min_area and areas[area_indexs[i + 1]] < min_area:
-                        max_contour = contours[area_index]
-                        break
-                    else:
-                        return texture
+            # largest region should be >= min area
+            if stats[max_label, cv2.CC_STAT_AREA] < min_area:
+                return texture
 
-            # get rotated rectangle and their box
-            rectangle = cv2.minAreaRect(max_contour)
-            bbox = np.int0(cv2.boxPoints(rectangle))
+            # get rotated rectangle of the region and their box
+            rectangle = cv2.minAreaRect(cv2.findNonZero((labels == max_label).astype(np.uint8)))
+            bbox = np.intp(cv2.boxPoints(rectangle))
 
-            # get min of x and y from rectangle
+            # get inner rectangle of the box, scale it back to the original size
             y_list = np.sort(bbox[:, 1])
             x_list = np.sort(bbox[:, 0])
-            y_top = y_list[1]
-            y_bottom = y_list[2]
-            x_left = x_list[1]
-            x_right = x_list[2]
+            y_top = min(max(y_list[1] * scale, 0), ysize)
+            y_bottom = min(max(y_list[2] * scale, 0), ysize)
+            x_left = min(max(x_list[1] * scale, 0), xsize)
+            x_right = min(max(x_list[2] * scale, 0), xsize)
 
             # crop texture
             texture_cropped = texture[y_top:y_bottom, x_left:x_right]
@@ -410,6 +525,9 @@ class PaperFactory(Augmentation):
         shape_h = shape[0]
         shape_w = shape[1]
 
+        # compute the final size first so that the texture is only resized once
+        zoom = (texture_w, texture_h)
+
         if texture_h > shape_h or texture_w > shape_w:  # Zoom out
             h_ratio = shape_h / texture_h
             w_ratio = shape_w / texture_w
@@ -420,10 +538,7 @@ class PaperFactory(Augmentation):
                 scale = random.uniform(w_ratio, 1.2)
 
             zoom = (int(texture_w * scale), int(texture_h * scale))
-            # print(f"Zoom out from {texture.shape} to {zoom}")
-            texture = cv2.resize(texture, zoom)
-            texture_h = texture.shape[0]
-            texture_w = texture.shape[1]
+            texture_w, texture_h = zoom
 
         if texture_h <= shape_h or texture_w <= shape_w:  # Zoom in
             h_ratio = shape_h / texture_h
@@ -434,7 +549,8 @@ class PaperFactory(Augmentation):
             else:
                 scale = random.uniform(w_ratio, w_ratio + 1.5)
             zoom = (int(texture_w * scale), int(texture_h * scale))
-            # print(f"Zoom in from {texture.shape} to {zoom}")
+
+        if zoom != (texture.shape[1], texture.shape[0]):
             texture = cv2.resize(texture, zoom)
 
         return texture
@@ -456,7 +572,7 @@ class PaperFactory(Augmentation):
                 texture_enable_color = self.texture_enable_color
 
             # get texture from paper
-            if len(self.paper_textures) > 0:
+            if len(self.paper_texture_files) > 0:
                 # get image texture
                 texture = self.retrieve_texture(image, 0)
             # generate random mask as texture
@@ -466,7 +582,7 @@ class PaperFactory(Augmentation):
             # blend multiple textures
             if blend_texture:
                 # get another image as texture
-                if len(self.blend_paper_textures) > 0:
+                if len(self.blend_paper_texture_files) > 0:
                     new_texture = self.retrieve_texture(texture, 1)
                     if len(new_texture.shape) < 3 and len(texture.shape) > 2:
                         new_texture = cv2.cvtColor(new_texture, cv2.COLOR_GRAY2BGR)
@@ -476,31 +592,15 @@ class PaperFactory(Augmentation):
                     new_texture = self.generate_random_texture(texture, 1)
 
                 # resize for size consistency between both textures
-                new_texture = cv2.resize(
-                    new_texture,
-                    (texture.shape[1], texture.shape[0]),
-                    interpolation=cv2.INTER_AREA,
-                )
+                if new_texture.shape[:2] != texture.shape[:2]:
+                    new_texture = cv2.resize(
+                        new_texture,
+                        (texture.shape[1], texture.shape[0]),
+                        interpolation=cv2.INTER_AREA,
+                    )
 
                 if self.blend_method == "random":
-                    blend_method = random.choice(
-                        [
-                            "ink_to_paper",
-                            "min",
-                            "max",
-                            "mix",
-                            "normal",
-                            "lighten",
-                            "darken",
-                            "screen",
-                            "dodge",
-                            "multiply",
-                            "divide",
-                            "grain_merge",
-                            "overlay",
-                            "FFT",
-                        ],
-                    )
+                    blend_method = random.choice(BLEND_METHODS)
                 else:
                     blend_method = self.blend_method
 
@@ -519,28 +619,8 @@ class PaperFactory(Augmentation):
 
             if texture_enable_color:
                 if len(texture.shape) < 3:
-                    # use ColorPaper to add color into the paper
-                    texture = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
-
                     if self.texture_color_blend_method == "random":
-                        texture_color_blend_method = random.choice(
-                            [
-                                "ink_to_paper",
-                                "min",
-                                "max",
-                                "mix",
-                                "normal",
-                                "lighten",
-                                "darken",
-                                "screen",
-                                "dodge",
-                                "multiply",
-                                "divide",
-                                "grain_merge",
-                                "overlay",
-                                "FFT",
-                            ],
-                        )
+                        texture_color_blend_method = random.choice(BLEND_METHODS)
                     else:
                         texture_color_blend_method = self.texture_color_blend_method
 
@@ -619,9 +699,9 @@ class PaperFactory(Augmentation):
                     saturation = color_hsv[:, :, 1][0][0]
                     saturation_range = [saturation - saturation_offset, saturation + saturation_offset]
 
-                    # add color
+                    # use ColorPaper to add color into the paper, gray texture is the value channel of the colored paper
                     color_paper = ColorPaper(hue_range=hue_range, saturation_range=saturation_range)
-                    texture = color_paper(texture)
+                    texture = color_paper.add_color_hsv(texture)
 
                     # add secondary color by using overlaybuilder
                     random_index2 = random.randint(random_index, len(colors) - 1)
@@ -646,12 +726,14 @@ class PaperFactory(Augmentation):
             texture_intensity = generate_average_intensity(texture)
             # brighten dark texture based on target intensity, max intensity = 255 (brightest)
             target_intensity = 180
-            if texture_intensity < target_intensity:
+            # skip brightening when the change is negligible or the texture is fully dark
+            if 0 < texture_intensity < target_intensity:
                 brighten_ratio = abs(texture_intensity - target_intensity) / texture_intensity
-                brighten_min = 1 + (brighten_ratio / 2)
-                brighten_max = 1 + brighten_ratio
-                brightness = Brightness(brightness_range=(brighten_min, brighten_max), min_brightness=1)
-                texture = brightness(texture)
+                if brighten_ratio >= 0.02:
+                    brighten_min = 1 + (brighten_ratio / 2)
+                    brighten_max = 1 + brighten_ratio
+                    brightness = Brightness(brightness_range=(brighten_min, brighten_max), min_brightness=1)
+                    texture = brightness(texture)
 
             # check for additional output of mask, keypoints and bounding boxes
             outputs_extra = []
@@ -1,11 +1,14 @@
-import random
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 
 import cv2
-import numba as nb
 import numpy as np
 from numba import config
 from numba import jit
-from sklearn.datasets import make_blobs
+from scipy import fft
 
 from augraphy.augmentations.lib import enhance_contrast
 
@@ -33,6 +36,10 @@ class TextureGenerator:
     def __init__(self, numba_jit=1):
         self.numba_jit = numba_jit
         config.DISABLE_JIT = bool(1 - numba_jit)
+        self.frequency_mask_cache = {}
+        # random generator of the instance, it is reseeded from the global numpy random state in each call
+        self.rng = np.random.default_rng()
+        self.gaussian_kernel_cache = {}
 
     # Adapted from this link:
     # # https://stackoverflow.com/questions/51646185/how-to-generate-a-paper-like-background-with-opencv
@@ -53,26 +60,24 @@ class TextureGenerator:
         :type turbulence: int
 
         """
-        image_output = np.full((ysize, xsize), fill_value=value, dtype="float")
+        image_output = np.full((ysize, xsize), fill_value=value, dtype="float32")
+        # reused buffer for the resized noise of each pyramid level
+        result_resized = np.empty((ysize, xsize), dtype="float32")
         ratio = min(xsize, ysize)
         while ratio != 1:
             new_ysize = int(ysize / ratio)
             new_xsize = int(xsize / ratio)
-            result = np.random.normal(0, sigma, (new_xsize, new_ysize, channel))
-            if ratio != 1:
-                result = cv2.resize(result, dsize=(xsize, ysize), interpolation=cv2.INTER_LINEAR)
-            image_output += result
+            result = self.rng.standard_normal((new_ysize, new_xsize), dtype="float32")
+            result *= sigma
+            cv2.resize(result, dsize=(xsize, ysize), dst=result_resized, interpolation=cv2.INTER_LINEAR)
+            np.add(image_output, result_resized, out=image_output)
             ratio = (ratio // turbulence) or 1
-        image_output = np.clip(image_output, 0, 255)
+        np.clip(image_output, 0, 255, out=image_output)
 
+        # rescale to new range and convert to uint8 in a single pass
         new_min = 32
         new_max = 255
-        image_output = ((image_output - np.min(image_output)) / (np.max(image_output) - np.min(image_output))) * (
-            new_max - new_min
-        ) + new_min
-
-        # convert to uint8
-        image_output = np.uint8(image_output)
+        image_output = cv2.normalize(image_output, None, new_min, new_max, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # conver to color image
         if channel == 3:
@@ -82,10 +87,8 @@ class TextureGenerator:
 
     # adapted from this repository:
     # https://github.com/NewYaroslav/strange_pattern
-    @staticmethod
-    @jit(nopython=True, cache=True, parallel=True)
-    def generate_strange_texture(oxsize, oysize):
-        """Generate a random strange texture.
+    def generate_strange_texture(self, oxsize, oysize):
+        """Generate a random single channel strange texture.
 
         :param oxsize: The width of the output texture image.
         :type oxsize: int
@@ -93,44 +96,34 @@ class TextureGenerator:
         :type oysize: int
         """
 
-        background_value = random.uniform(0.04, 0.11)
+        background_value = self.rng.uniform(0.04, 0.11)
 
         # initialize random parameter
-        t_random = random.uniform(0, 100)
-        m_random = [random.uniform(0, 100), random.uniform(0, 100)]
-
-        # initialize output
-        image_strange_texture = np.zeros((oysize, oxsize, 3))
-
-        # calculate color
-        for y in nb.prange(oysize):
-            for x in nb.prange(oxsize):
-
-                # initial value
-                value = int(x + t_random * 80.0 + m_random[0] * 10.0) ^ int(y + t_random * 80.0 + m_random[1] * 10.0)
-
-                # update pixel value
-                color = 1.0
-                if value <= 1:
-                    color = background_value
-                if value % 2 == 0 and value > 2:
-                    color = background_value
-                for i in range(3, int(np.floor(np.sqrt(float(value)))), random.randint(1, 10)):
-                    if value % i == 0:
-                        color = background_value
-
-                # generate random color
-                new_color = [
-                    color / random.uniform(0.01, 3),
-                    color / random.uniform(0.01, 3),
-                    color / random.uniform(0.01, 3),
-                ]
-
-                # update color
-                image_strange_texture[y, x] = new_color
+        t_random = self.rng.uniform(0, 100)
+        m_random = self.rng.uniform(0, 100, 2)
+
+        # initial value of each pixel
+        x_offset = int(t_random * 80.0 + m_random[0] * 10.0)
+        y_offset = int(t_random * 80.0 + m_random[1] * 10.0)
+        x_values = np.arange(oxsize, dtype="int32") + x_offset
+        y_values = np.arange(oysize, dtype="int32") + y_offset
+        value = x_values[None, :] ^ y_values[:, None]
+
+        # background for value <= 1 and even value > 2
+        is_background = (value <= 1) | ((value % 2 == 0) & (value > 2))
+
+        # background for value divisible by any sampled factor i, where (i + 1) ** 2 <= value
+        step = int(self.rng.integers(1, 11))
+        for i in range(3, int(np.sqrt(value.max())), step):
+            is_background |= (value % i == 0) & (value >= (i + 1) * (i + 1))
+
+        color = np.where(is_background, background_value, 1.0)
+
+        # generate random grayscale color
+        image_strange_texture = color / self.rng.uniform(0.01, 3, size=(oysize, oxsize))
 
         # rotate texture randomly
-        image_strange_texture = np.rot90(image_strange_texture, random.randint(0, 3))
+        image_strange_texture = np.rot90(image_strange_texture, int(self.rng.integers(0, 4)))
 
         return image_strange_texture
 
@@ -157,54 +150,44 @@ class TextureGenerator:
         n_samples = [1080, 1280]
         stds = [int(ixsize / 4), int(iysize / 4)]
 
-        n_samples = [
-            random.randint(n_samples[0], n_samples[1]) for i in range(random.randint(n_clusters[0], n_clusters[1]))
-        ]
-        std = random.randint(stds[0], stds[1])
-
-        generated_points_x = np.array([[0]], dtype=("float"))
-        generated_points_y = np.array([[0]], dtype=("float"))
+        n_samples = self.rng.integers(
+            n_samples[0],
+            n_samples[1] + 1,
+            int(self.rng.integers(n_clusters[0], n_clusters[1] + 1)),
+        )
+        std = int(self.rng.integers(stds[0], stds[1] + 1))
 
-        for center_x, center_y in zip(center_xs, center_ys):
+        # all clusters of a center share the same mean, so their noises are drawn from a single normal distribution
+        total_samples = int(np.sum(n_samples))
+        generated_points_x = np.empty((len(center_xs) * total_samples, 1), dtype="float32")
+        generated_points_y = np.empty((len(center_ys) * total_samples, 1), dtype="float32")
 
-            # generate clusters of noises
-            cgenerated_points_x, _ = make_blobs(
-                n_samples=n_samples,
-                center_box=(center_x, center_x),
-                cluster_std=std,
-                n_features=1,
-            )
+        for i, (center_x, center_y) in enumerate(zip(center_xs, center_ys)):
 
             # generate clusters of noises
-            cgenerated_points_y, _ = make_blobs(
-                n_samples=n_samples,
-                center_box=(center_y, center_y),
-                cluster_std=std,
-                n_features=1,
-            )
-
-            generated_points_x = np.concatenate((generated_points_x, cgenerated_points_x), axis=0)
-            generated_points_y = np.concatenate((generated_points_y, cgenerated_points_y), axis=0)
+            start = i * total_samples
+            for generated_points, center in ((generated_points_x, center_x), (generated_points_y, center_y)):
+                cluster_points = generated_points[start : start + total_samples]
+                self.rng.standard_normal(dtype="float32", out=cluster_points)
+                cluster_points *= std
+                cluster_points += center
 
         # generate x and y points of noise
-        generated_points_x = generated_points_x.astype("int")
-        generated_points_y = generated_points_y.astype("int")
+        generated_points_x = generated_points_x[:, 0].astype("int32")
+        generated_points_y = generated_points_y[:, 0].astype("int32")
 
         # remove invalid points
-        ind_delete_x1 = np.where(generated_points_x < 2)
-        ind_delete_x2 = np.where(generated_points_x >= ixsize - 2)
-        ind_delete_y1 = np.where(generated_points_y < 2)
-        ind_delete_y2 = np.where(generated_points_y >= iysize - 2)
-
-        ind_delete = np.concatenate(
-            (ind_delete_x1, ind_delete_x2, ind_delete_y1, ind_delete_y2),
-            axis=1,
+        valid_points = (
+            (generated_points_x >= 2)
+            & (generated_points_x < ixsize - 2)
+            & (generated_points_y >= 2)
+            & (generated_points_y < iysize - 2)
         )
-        generated_points_x = np.delete(generated_points_x, ind_delete, axis=0)
-        generated_points_y = np.delete(generated_points_y, ind_delete, axis=0)
+        generated_points_x = generated_points_x[valid_points]
+        generated_points_y = generated_points_y[valid_points]
 
         # update noise value
-        image_random = np.random.random((iysize, ixsize))
+        image_random = self.rng.random((iysize, ixsize))
         image_random[image_random < noise_value[0] / 255] = 0
         image_random[image_random > noise_value[1] / 255] = 0
         image_random = (image_random * 255).astype("uint8")
@@ -213,13 +196,13 @@ class TextureGenerator:
         image_noise[generated_points_y, generated_points_x] = image_random[generated_points_y, generated_points_x]
 
         # apply blur
-        image_noise = cv2.GaussianBlur(image_noise, (random.choice([7, 9, 11, 13]), random.choice([7, 9, 11, 13])), 0)
+        image_noise = self.gaussian_blur(image_noise, tuple(self.rng.choice((7, 9, 11, 13), 2).tolist()))
 
         # create edge texture
         image_edge_texture = image_noise + image_noise
 
         # resize to expected size
-        image_edge_texture = cv2.resize(image_edge_texture, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        image_edge_texture = self.resize_texture(image_edge_texture, (oxsize, oysize))
 
         return image_edge_texture
 
@@ -254,13 +237,13 @@ class TextureGenerator:
         wave_grid_output = cv2.GaussianBlur(wave_grid_output, (3, 3), 0)
 
         # remove low frequency area
-        wave_grid_output = self.remove_frequency(wave_grid_output, random.randint(25, 35))
+        wave_grid_output = self.remove_frequency(wave_grid_output, int(self.rng.integers(25, 36)))
 
         # median filter to smoothen texture
         wave_grid_output = cv2.medianBlur(wave_grid_output, 5)
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -283,11 +266,11 @@ class TextureGenerator:
 
         for _ in range(10):
             wave_grid = np.zeros((ysize, xsize), dtype="float")
-            for _ in range(number_granules):
-                y = np.random.randint(0, ysize)
-                x = np.random.randint(0, xsize)
-                intensity = np.random.randint(0, 25)  # Intensity of the spot
-                granule_size = random.randint(1, granule_max_size)
+            ys = self.rng.integers(0, ysize, number_granules).tolist()
+            xs = self.rng.integers(0, xsize, number_granules).tolist()
+            intensities = self.rng.integers(0, 25, number_granules).tolist()  # Intensity of the spots
+            granule_sizes = self.rng.integers(1, granule_max_size + 1, number_granules).tolist()
+            for y, x, intensity, granule_size in zip(ys, xs, intensities, granule_sizes):
                 wave_grid[y : y + granule_size, x : x + granule_size] += intensity
 
             wave_grid_output += cv2.medianBlur(np.uint8(wave_grid), 9).astype("float")
@@ -312,7 +295,7 @@ class TextureGenerator:
         ]
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -355,23 +338,18 @@ class TextureGenerator:
         wave_grid_output = wave_grid_output[offset:-offset, offset:-offset]
 
         # rescale
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-        wave_grid_output = 255 - np.uint8(wave_grid_output * 255)
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        wave_grid_output = cv2.bitwise_not(wave_grid_output)
 
         # remove frequency > 100
         frequency = 100
         wave_grid_output = self.remove_frequency(wave_grid_output, frequency)
 
         # rescale again
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -394,13 +372,12 @@ class TextureGenerator:
         wave_grid_output = np.zeros((ysize, xsize), dtype="float")
 
         for _ in range(30):
-            intensity = np.random.randint(1, 2)  # Intensity of the spot
+            intensity = int(self.rng.integers(1, 2))  # Intensity of the spot
             wave_grid = np.zeros((ysize, xsize), dtype="float")
-            for _ in range(number_granules):
-                y = np.random.randint(0, ysize)
-                x = np.random.randint(0, xsize)
-
-                granule_size = random.randint(granule_min_size, granule_max_size)
+            ys = self.rng.integers(0, ysize, number_granules).tolist()
+            xs = self.rng.integers(0, xsize, number_granules).tolist()
+            granule_sizes = self.rng.integers(granule_min_size, granule_max_size + 1, number_granules).tolist()
+            for y, x, granule_size in zip(ys, xs, granule_sizes):
                 cv2.circle(wave_grid, (x, y), granule_size, intensity, thickness=-1)
 
             wave_grid_output += wave_grid
@@ -411,8 +388,8 @@ class TextureGenerator:
         wave_grid_output = np.fliplr(wave_grid_output3) + np.flipud(wave_grid_output3)
 
         # create single directional gradient effect
-        offset = random.randint(1, 3)
-        direction = random.choice([0, 1, 2, 3])
+        offset = int(self.rng.integers(1, 4))
+        direction = int(self.rng.integers(0, 4))
         if direction == 0:
             wave_grid_output = wave_grid_output[offset:, :] - wave_grid_output[:-offset, :]
         elif direction == 1:
@@ -422,13 +399,8 @@ class TextureGenerator:
         else:
             wave_grid_output = wave_grid_output[:, :-offset] - wave_grid_output[:, offset:]
 
-        # rescale into 0-1
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-
-        # convert to uint8
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        # rescale into 0 - 255 and convert to uint8
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
         wave_grid_output = cv2.GaussianBlur(wave_grid_output, (5, 5), 0)
 
         # remove dark area
@@ -443,7 +415,7 @@ class TextureGenerator:
         ]
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -463,10 +435,9 @@ class TextureGenerator:
         wave_grid_output = np.zeros((ysize, xsize), dtype="uint8")
         kernel_size = 9
         for i in range(10):
-            wave_grid_output += cv2.GaussianBlur(
-                np.random.randint(188, 255, size=(ysize, xsize), dtype="uint8"),
+            wave_grid_output += self.gaussian_blur(
+                self.rng.integers(188, 255, size=(ysize, xsize), dtype="uint8"),
                 (kernel_size, kernel_size),
-                0,
             )
         wave_grid_output = cv2.GaussianBlur(wave_grid_output, (3, 3), 0)
 
@@ -475,8 +446,8 @@ class TextureGenerator:
         wave_grid_output = self.remove_frequency(wave_grid_output, frequency)
 
         # create single directional gradient effect
-        offset = random.randint(2, 4)
-        direction = random.choice([0, 1, 2, 3])
+        offset = int(self.rng.integers(2, 5))
+        direction = int(self.rng.integers(0, 4))
         if direction == 0:
             wave_grid_output = wave_grid_output[offset:, :] - wave_grid_output[:-offset, :]
         elif direction == 1:
@@ -486,22 +457,16 @@ class TextureGenerator:
         else:
             wave_grid_output = wave_grid_output[:, :-offset] - wave_grid_output[:, offset:]
 
-        # rescale into 0-1
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-
-        # rescale to new range
+        # rescale to new range and convert to uint8
         new_max = 255
-        new_min = random.randint(220, 250)
-        wave_grid_output = wave_grid_output * (new_max - new_min) + new_min
-        wave_grid_output = np.uint8(wave_grid_output)
+        new_min = int(self.rng.integers(220, 251))
+        wave_grid_output = cv2.normalize(wave_grid_output, None, new_min, new_max, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # smooth the texture
-        wave_grid_output = cv2.GaussianBlur(wave_grid_output, (9, 9), 0)
+        wave_grid_output = self.gaussian_blur(wave_grid_output, (9, 9))
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -532,13 +497,12 @@ class TextureGenerator:
         wave_grid_output = np.zeros((ysize, xsize), dtype="float")
 
         for _ in range(50):
-            intensity = np.random.randint(1, 2)  # Intensity of the spot
+            intensity = int(self.rng.integers(1, 2))  # Intensity of the spot
             wave_grid = np.zeros((ysize, xsize), dtype="float")
-            for _ in range(number_granules):
-                y = np.random.randint(0, ysize)
-                x = np.random.randint(0, xsize)
-
-                granule_size = random.randint(granule_min_size, granule_max_size)
+            ys = self.rng.integers(0, ysize, number_granules).tolist()
+            xs = self.rng.integers(0, xsize, number_granules).tolist()
+            granule_sizes = self.rng.integers(granule_min_size, granule_max_size + 1, number_granules).tolist()
+            for y, x, granule_size in zip(ys, xs, granule_sizes):
                 cv2.circle(wave_grid, (x, y), granule_size, intensity, thickness=-1)
 
             wave_grid_output += wave_grid
@@ -553,8 +517,8 @@ class TextureGenerator:
         wave_grid_output = np.fliplr(wave_grid_output3) + np.flipud(wave_grid_output3)
 
         # create single directional gradient effect
-        direction = random.choice([0, 1, 2, 3])
-        offset = random.randint(1, 3)
+        direction = int(self.rng.integers(0, 4))
+        offset = int(self.rng.integers(1, 4))
         if direction == 0:
             wave_grid_output = wave_grid_output[offset:, :] - wave_grid_output[:-offset, :]
         elif direction == 1:
@@ -564,13 +528,8 @@ class TextureGenerator:
         else:
             wave_grid_output = wave_grid_output[:, :-offset] - wave_grid_output[:, offset:]
 
-        # rescale into 0-1
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-
-        # convert to uint8
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        # rescale into 0 - 255 and convert to uint8
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
         wave_grid_output = cv2.GaussianBlur(wave_grid_output, (5, 5), 0)
 
         # remove dark area
@@ -585,7 +544,7 @@ class TextureGenerator:
         ]
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -624,16 +583,13 @@ class TextureGenerator:
         wave_grid_output = self.remove_frequency(wave_grid_output, frequency)
 
         # rescale
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # blur to smoothen trexture
-        wave_grid_output = cv2.GaussianBlur(wave_grid_output, (9, 9), 0)
+        wave_grid_output = self.gaussian_blur(wave_grid_output, (9, 9))
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -678,26 +634,21 @@ class TextureGenerator:
         wave_grid_output = wave_grid_output[offset:-offset, offset:-offset]
 
         # rescale
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-        wave_grid_output = 255 - np.uint8(wave_grid_output * 255)
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        wave_grid_output = cv2.bitwise_not(wave_grid_output)
 
         # remove frequency > 100
         frequency = 100
         wave_grid_output = self.remove_frequency(wave_grid_output, frequency)
 
         # rescale again
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # blur to smoothen texture
         wave_grid_output = cv2.GaussianBlur(wave_grid_output, (3, 3), 0)
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -722,19 +673,14 @@ class TextureGenerator:
         frequency = 50
         wave_grid_output = self.remove_frequency(wave_grid_output, frequency)
 
-        # rescale
-        wave_grid_output = (wave_grid_output - wave_grid_output.min()) / (
-            wave_grid_output.max() - wave_grid_output.min()
-        )
-
-        # convert to uint8
-        wave_grid_output = np.uint8(wave_grid_output * 255)
+        # rescale into 0 - 255 and convert to uint8
+        wave_grid_output = cv2.normalize(wave_grid_output, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
 
         # median filter to smoothen texture
         wave_grid_output = cv2.medianBlur(wave_grid_output, 3)
 
         # resize to output size
-        wave_grid_output = cv2.resize(wave_grid_output, (oxsize, oysize), interpolation=cv2.INTER_LINEAR)
+        wave_grid_output = self.resize_texture(wave_grid_output, (oxsize, oysize))
 
         return wave_grid_output
 
@@ -754,13 +700,13 @@ class TextureGenerator:
         crkx,
         crky,
     ):
-        """Generate random wave grid, process it in FFT and convert it back into spatial domain.
+        """Generate random wave grid by summing multiple grids of waves.
 
         :param xsize: The width of the output image.
         :type xsize: int
         :param ysize: The height of the output image.
         :type ysize: int
-        :param f_iterations: Tuple of ints in determining the number of iterations in adding FFT converted wave grid.
+        :param f_iterations: Tuple of ints in determining the number of iterations in adding normalized wave grid.
         :type f_iterations: tuple
         :param g_iterations: Tuple of ints in determining the number of iterations in summing grid waves.
         :type g_iterations: tuple
@@ -786,21 +732,22 @@ class TextureGenerator:
 
         wave_grid_output = np.zeros((ysize, xsize), dtype="uint8")
 
-        for i in range(random.randint(f_iterations[0], f_iterations[1])):
+        for i in range(self.rng.integers(f_iterations[0], f_iterations[1] + 1)):
             # fixed resolution of the wave image
-            resolution = random.uniform(rresolutions[0], rresolutions[1])
+            resolution = self.rng.uniform(rresolutions[0], rresolutions[1])
 
-            # Create a 2D grid of coordinates
-            x_array = np.arange(-xsize / 2, xsize / 2) * resolution
-            y_array = np.arange(-ysize / 2, ysize / 2) * resolution
-            x_grid, y_grid = np.meshgrid(x_array, y_array)
+            # Create the x and y coordinates, the 2D grid is formed by broadcasting in generate_wave_grid
+            x_array = (np.arange(-xsize / 2, xsize / 2) * resolution).astype("float32")
+            y_array = (np.arange(-ysize / 2, ysize / 2) * resolution).astype("float32")
 
-            wave_grid_fft_shifted = np.zeros((ysize, xsize), dtype="complex")
-            for i in range(random.randint(g_iterations[0], g_iterations[1])):
+            # sum of wave grids, summing the shifted FFT of each grid and converting it back
+            # with an inverse FFT is equivalent to summing the grids in the spatial domain
+            wave_grid_sum = np.zeros((ysize, xsize), dtype="float32")
+            for i in range(self.rng.integers(g_iterations[0], g_iterations[1] + 1)):
                 # iterations for adding waves
-                wave_grid = self.generate_wave_grid(
-                    x_grid,
-                    y_grid,
+                wave_grid_sum += self.generate_wave_grid(
+                    x_array,
+                    y_array,
                     xsize,
                     ysize,
                     iterations=g_iterations,
@@ -814,33 +761,21 @@ class TextureGenerator:
                     crky=crky,
                 )
 
-                # Compute the FFT of the wave heights, shift the zero-frequency component to the center and then sum them
-                wave_grid_fft_shifted += np.fft.fftshift(np.fft.fft2(wave_grid))
-
-            # unshift the FFT component
-            new_wave_grid = np.fft.ifft2(np.fft.ifftshift((wave_grid_fft_shifted)))
-
-            # get the real part only
-            new_wave_grid = np.real(new_wave_grid)
+            # scale to 0 - 255 and convert to uint8
+            new_wave_grid = cv2.normalize(wave_grid_sum, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
 
-            # scale to 0 -1
-            new_wave_grid = (new_wave_grid - new_wave_grid.min()) / (new_wave_grid.max() - new_wave_grid.min())
-
-            # convert to uint8
-            new_wave_grid = np.uint8(new_wave_grid * 255)
-
-            # merge into output
-            wave_grid_output += new_wave_grid
+            # merge into output, the uint8 sum wraps around intentionally, creating the edges of stains
+            np.add(wave_grid_output, new_wave_grid, out=wave_grid_output)
 
         return wave_grid_output
 
-    def generate_wave_grid(self, xgrid, ygrid, xsize, ysize, iterations, rA, rf, srp, srkx, srky, crp, crkx, crky):
+    def generate_wave_grid(self, x_array, y_array, xsize, ysize, iterations, rA, rf, srp, srkx, srky, crp, crkx, crky):
         """Create grid of waves using heights of sine and cosine waves.
 
-        :param xgrid: The x coordinates grid.
-        :type xgrid: numpy array
-        :param ygrid: The y coordinates grid.
-        :type ygrid: numpy array
+        :param x_array: The x coordinates of the grid.
+        :type x_array: numpy array
+        :param y_array: The y coordinates of the grid.
+        :type y_array: numpy array
         :param xsize: The width of the output grid image.
         :type xsize: int
         :param ysize: The height of the output grid image.
@@ -866,32 +801,123 @@ class TextureGenerator:
         """
 
         # iterations for adding waves
-        current_iterations = random.randint(iterations[0], iterations[1])
-
-        wave_grid = np.zeros((ysize, xsize), dtype="float")
-        for i in range(current_iterations):
-
-            # Calculate the wave height using a sine function
-            A = np.random.uniform(rA[0], rA[1])  # Amplitude
-            f = np.random.uniform(rf[0], rf[1])  # Frequency
-            p = np.random.uniform(srp[0], srp[1])  # Phase
-            kx = np.random.uniform(srkx[0], srkx[1])  # x-component of wave vector
-            ky = np.random.uniform(srky[0], srky[1])  # y-component of wave vector
-            h_sine = A * np.sin(2 * np.pi * (f * (kx * xgrid + ky * ygrid) - p))
-
-            # Calculate the wave height using a cosine function
-            A = np.random.uniform(rA[0], rA[1])  # Amplitude
-            f = np.random.uniform(rf[0], rf[1])  # Frequency
-            p = np.random.uniform(crp[0], crp[1])  # Phase
-            kx = np.random.uniform(crkx[0], crkx[1])  # x-component of wave vector
-            ky = np.random.uniform(crky[0], crky[1])  # y-component of wave vector
-            h_cosine = A * np.cos(2 * np.pi * (f * (kx * xgrid + ky * ygrid) - p))
-
-            # combine heights from sine and cosine
-            wave_grid = h_sine + h_cosine
+        current_iterations = int(self.rng.integers(iterations[0], iterations[1] + 1))
+
+        # sample parameters of all sine and cosine waves, 2 * pi is folded into the wave vectors and phases
+        wave_parameters = []
+        for rp, rkx, rky in ((srp, srkx, srky), (crp, crkx, crky)):
+            A = self.rng.uniform(rA[0], rA[1], current_iterations)  # Amplitude
+            f = self.rng.uniform(rf[0], rf[1], current_iterations)  # Frequency
+            p = self.rng.uniform(rp[0], rp[1], current_iterations)  # Phase
+            kx = self.rng.uniform(rkx[0], rkx[1], current_iterations)  # x-component of wave vector
+            ky = self.rng.uniform(rky[0], rky[1], current_iterations)  # y-component of wave vector
+            wave_parameters += [A, 2 * np.pi * f * kx, 2 * np.pi * f * ky, 2 * np.pi * p]
+
+        wave_parameters = [parameter.astype("float32") for parameter in wave_parameters]
+
+        return self.sum_waves(x_array.astype("float32"), y_array.astype("float32"), *wave_parameters)
+
+    @staticmethod
+    @jit(nopython=True, cache=True, nogil=True, fastmath=True)
+    def sum_waves(x_array, y_array, A_sine, wx_sine, wy_sine, p_sine, A_cosine, wx_cosine, wy_cosine, p_cosine):
+        """Sum the heights of sine and cosine waves, A * sin(wx * x + wy * y - p), on a grid.
+
+        :param x_array: The x coordinates of the grid.
+        :type x_array: numpy array
+        :param y_array: The y coordinates of the grid.
+        :type y_array: numpy array
+        :param A_sine: The amplitudes of sine waves.
+        :type A_sine: numpy array
+        :param wx_sine: The x-component of angular wave vectors of sine waves.
+        :type wx_sine: numpy array
+        :param wy_sine: The y-component of angular wave vectors of sine waves.
+        :type wy_sine: numpy array
+        :param p_sine: The angular phases of sine waves.
+        :type p_sine: numpy array
+        :param A_cosine: The amplitudes of cosine waves.
+        :type A_cosine: numpy array
+        :param wx_cosine: The x-component of angular wave vectors of cosine waves.
+        :type wx_cosine: numpy array
+        :param wy_cosine: The y-component of angular wave vectors of cosine waves.
+        :type wy_cosine: numpy array
+        :param p_cosine: The angular phases of cosine waves.
+        :type p_cosine: numpy array
+        """
+
+        ysize = y_array.shape[0]
+        xsize = x_array.shape[0]
+
+        # the phase is separable, sin(a + b) = sin(a)cos(b) + cos(a)sin(b) and cos(a + b) = cos(a)cos(b) - sin(a)sin(b),
+        # so the x dependent terms are computed once and each row only needs the sine and cosine of its y term
+        sine_sx = np.empty((A_sine.shape[0], xsize), dtype=np.float32)
+        sine_cx = np.empty((A_sine.shape[0], xsize), dtype=np.float32)
+        for i in range(A_sine.shape[0]):
+            for x in range(xsize):
+                sine_sx[i, x] = A_sine[i] * np.sin(wx_sine[i] * x_array[x])
+                sine_cx[i, x] = A_sine[i] * np.cos(wx_sine[i] * x_array[x])
+
+        cosine_sx = np.empty((A_cosine.shape[0], xsize), dtype=np.float32)
+        cosine_cx = np.empty((A_cosine.shape[0], xsize), dtype=np.float32)
+        for i in range(A_cosine.shape[0]):
+            for x in range(xsize):
+                cosine_sx[i, x] = A_cosine[i] * np.sin(wx_cosine[i] * x_array[x])
+                cosine_cx[i, x] = A_cosine[i] * np.cos(wx_cosine[i] * x_array[x])
+
+        wave_grid = np.zeros((ysize, xsize), dtype=np.float32)
+        for y in range(ysize):
+            for i in range(A_sine.shape[0]):
+                phase_y = wy_sine[i] * y_array[y] - p_sine[i]
+                sy = np.sin(phase_y)
+                cy = np.cos(phase_y)
+                for x in range(xsize):
+                    wave_grid[y, x] += sine_sx[i, x] * cy + sine_cx[i, x] * sy
+            for i in range(A_cosine.shape[0]):
+                phase_y = wy_cosine[i] * y_array[y] - p_cosine[i]
+                sy = np.sin(phase_y)
+                cy = np.cos(phase_y)
+                for x in range(xsize):
+                    wave_grid[y, x] += cosine_cx[i, x] * cy - cosine_sx[i, x] * sy
 
         return wave_grid
 
+    def resize_texture(self, image, size):
+        """Resize texture image, using area interpolation when the texture is downscaled.
+
+        :param image: The input texture image.
+        :type image: numpy array
+        :param size: The width and height of the output texture image.
+        :type size: tuple
+        """
+
+        ysize, xsize = image.shape[:2]
+        if size[0] * size[1] < xsize * ysize:
+            interpolation = cv2.INTER_AREA
+        else:
+            interpolation = cv2.INTER_LINEAR
+
+        return cv2.resize(image, size, interpolation=interpolation)
+
+    def gaussian_blur(self, image, kernel_size):
+        """Blur image with a cached separable Gaussian kernel, equivalent to cv2.GaussianBlur with sigma = 0.
+        The output is within two intensity levels of cv2.GaussianBlur, due to its fixed point rounding.
+        For the larger kernels used in the textures, cv2.sepFilter2D is faster than cv2.GaussianBlur on uint8 images.
+
+        :param image: The input image.
+        :type image: numpy array
+        :param kernel_size: The width and height of the Gaussian kernel.
+        :type kernel_size: tuple
+        """
+
+        kernels = []
+        for ksize in kernel_size:
+            kernel = self.gaussian_kernel_cache.get(ksize)
+            if kernel is None:
+                kernel = cv2.getGaussianKernel(ksize, 0, cv2.CV_32F)
+                self.gaussian_kernel_cache[ksize] = kernel
+            kernels.append(kernel)
+
+        return cv2.sepFilter2D(image, -1, kernels[0], kernels[1])
+
     def remove_frequency(self, wave_grid_output, frequency1, frequency2=None):
         """Remove image area bigger than the input frequency by using FFT.
 
@@ -905,33 +931,30 @@ class TextureGenerator:
 
         ysize, xsize = wave_grid_output.shape[:2]
 
-        cy, cx = ysize // 2, xsize // 2
-        mask = np.ones((ysize, xsize), np.uint8)
-
-        r = frequency1
-        # compute mask to remove low frequency area
-        y, x = np.ogrid[:ysize, :xsize]
-        mask_area = (x - cx) ** 2 + (y - cy) ** 2 <= r * r
-        mask[mask_area] = 0
-        if frequency2 is not None:
-            r = frequency2
-            mask_area = (x - cx) ** 2 + (y - cy) ** 2 > r * r
-            mask[mask_area] = 0
-
-        # convert to fft and shift to zero-frequency
-        wave_grid_output_fft = np.fft.fft2(wave_grid_output)
-        wave_grid_output_fft_shifted = np.fft.fftshift(wave_grid_output_fft)
-
-        # apply mask and inverse DFT
-        wave_grid_output_fft_shifted *= mask
-        wave_grid_output2_fft = np.fft.ifft2(np.fft.ifftshift(wave_grid_output_fft_shifted))
-        wave_grid_output2 = np.abs(wave_grid_output2_fft)
-
-        # normalize image back to 0 - 255
-        wave_grid_output2 = (wave_grid_output2 - wave_grid_output2.min()) / (
-            wave_grid_output2.max() - wave_grid_output2.min()
-        )
-        wave_grid_output = 255 - np.uint8(wave_grid_output2 * 255)
+        # mask to remove frequency area, cached since input sizes and frequencies are mostly fixed
+        mask_key = (ysize, xsize, frequency1, frequency2)
+        mask = self.frequency_mask_cache.get(mask_key)
+        if mask is None:
+            # frequency of each element in the unshifted real FFT layout
+            frequency_y = fft.fftfreq(ysize, d=1.0 / ysize)[:, None]
+            frequency_x = fft.rfftfreq(xsize, d=1.0 / xsize)[None, :]
+            frequency_distance = frequency_x**2 + frequency_y**2
+
+            # compute mask to remove low frequency area
+            mask_area = frequency_distance > frequency1 * frequency1
+            if frequency2 is not None:
+                mask_area &= frequency_distance <= frequency2 * frequency2
+            mask = mask_area.astype("float32")
+            self.frequency_mask_cache[mask_key] = mask
+
+        # convert to real fft, apply mask and inverse DFT
+        wave_grid_output_fft = fft.rfft2(wave_grid_output.astype("float32"), workers=-1)
+        np.multiply(wave_grid_output_fft, mask, out=wave_grid_output_fft)
+        wave_grid_output2 = np.abs(fft.irfft2(wave_grid_output_fft, s=(ysize, xsize), overwrite_x=True, workers=-1))
+
+        # normalize image back to 0 - 255 and invert it
+        wave_grid_output = cv2.normalize(wave_grid_output2, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        wave_grid_output = cv2.bitwise_not(wave_grid_output)
 
         return wave_grid_output
 
@@ -969,44 +992,46 @@ class TextureGenerator:
         # hsv channel of texture
         image_hsv = cv2.cvtColor(image_texture, cv2.COLOR_BGR2HSV)
 
+        # integral image of hsv channels, so that the mean of each patch needs only four lookups
+        image_hsv_integral = cv2.integral(image_hsv)
+
         # get a reference patch's hue, saturation and value
 
-        n = 0
-        while n < 10:
-            y = np.random.randint(ysize - patch_size)
-            x = np.random.randint(xsize - patch_size)
-            # to prevent black or white blank image
-            if (
-                np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 2]) < 245
-                and np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 2]) > 10
-            ):
-                break
-            n += 1
-
-        h_reference = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 0])
-        s_reference = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 1])
-        v_reference = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 2])
+        # use a fixed number of candidates, the last candidate is used if none of them is valid
+        ys = self.rng.integers(ysize - patch_size, size=10)
+        xs = self.rng.integers(xsize - patch_size, size=10)
+        patch_means = self.get_patch_mean(image_hsv_integral, ys, xs, patch_size)
+        # to prevent black or white blank image
+        is_valid = (patch_means[:, 2] < 245) & (patch_means[:, 2] > 10)
+        index = np.argmax(is_valid) if is_valid.any() else -1
+
+        h_reference, s_reference, v_reference = patch_means[index]
         offset = 10
-        h_range = [h_reference - offset, h_reference + offset]
-        s_range = [s_reference - offset, s_reference + offset]
-        v_range = [v_reference - offset, v_reference + offset]
+        range_start = np.array([h_reference - offset, s_reference - offset, v_reference - offset])
+        range_end = np.array([h_reference + offset, s_reference + offset, v_reference + offset])
+
+        # draw the default patch and a fixed number of candidate patches for every patch of output
+        patch_shape = (patch_number_height, patch_number_width)
+        default_ys = self.rng.integers(ysize - patch_size, size=patch_shape)
+        default_xs = self.rng.integers(xsize - patch_size, size=patch_shape)
+        candidate_ys = self.rng.integers(ysize - patch_size, size=patch_shape + (10,))
+        candidate_xs = self.rng.integers(xsize - patch_size, size=patch_shape + (10,))
 
         # generate and apply random patch
-        for i in range(patch_number_height):
-            for j in range(patch_number_width):
-                y = i * (patch_size - overlap)
-                x = j * (patch_size - overlap)
-                image_patch = self.get_random_patch(
-                    image_texture,
-                    image_hsv,
-                    patch_size,
-                    ysize,
-                    xsize,
-                    h_range,
-                    s_range,
-                    v_range,
-                )
-                image_quilt[y : y + patch_size, x : x + patch_size] = image_patch
+        self.apply_random_patches(
+            image_texture,
+            image_hsv_integral,
+            image_quilt,
+            default_ys,
+            default_xs,
+            candidate_ys,
+            candidate_xs,
+            patch_size,
+            overlap,
+            range_start,
+            range_end,
+            v_reference,
+        )
 
         # smoothing
         image_quilt = cv2.medianBlur(image_quilt, ksize=11)
@@ -1020,64 +1045,121 @@ class TextureGenerator:
 
         return image_quilt
 
-    def get_random_patch(self, image_texture, image_hsv, patch_size, ysize, xsize, h_range, s_range, v_range):
-        """Get patch of image from texture based on input hue, saturation and value range.
+    def get_patch_mean(self, image_integral, y, x, patch_size):
+        """Get the mean of each channel in square patches of image from its integral image.
 
-        :param image_texture: The input image texture.
-        :type image_texture: numpy array
-        :param image_hsv: The input image texture in HSV channel.
-        :type image_hsv: numpy array
-        :param patch_size: The size of each image patch.
+        :param image_integral: The integral image of the input image.
+        :type image_integral: numpy array
+        :param y: The y coordinates of the top left corner of the patches.
+        :type y: int or numpy array
+        :param x: The x coordinates of the top left corner of the patches.
+        :type x: int or numpy array
+        :param patch_size: The size of the patch.
         :type patch_size: int
-        :param y_size: The height of image texture.
-        :type y_size: int
-        :param x_size: The width of image texture.
-        :type x_size: int
-        :param h_range: The range of reference hue values.
-        :type h_range: tuple
-        :param s_range: The range of reference saturation values.
-        :type s_range: tuple
-        :param v_range: The range of reference value values.
-        :type v_range: tuple
         """
 
-        n = 0
-        y = np.random.randint(ysize - patch_size)
-        x = np.random.randint(xsize - patch_size)
-        image_patch = image_texture[y : y + patch_size, x : x + patch_size]
-
-        # use a fixed number to prevent infinity loops
-        while n < 10:
-
-            y = np.random.randint(ysize - patch_size)
-            x = np.random.randint(xsize - patch_size)
-
-            # get mean of h, s and v channel of current patch
-            h_mean = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 0])
-            s_mean = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 1])
-            v_mean = np.mean(image_hsv[y : y + patch_size, x : x + patch_size, 2])
+        patch_sum = (
+            image_integral[y + patch_size, x + patch_size]
+            - image_integral[y, x + patch_size]
+            - image_integral[y + patch_size, x]
+            + image_integral[y, x]
+        )
 
-            if (
-                h_mean >= h_range[0]
-                and h_mean < h_range[1]
-                and s_mean >= s_range[0]
-                and s_mean < s_range[1]
-                and v_mean >= v_range[0]
-                and v_mean < v_range[1]
-            ):
+        return patch_sum / (patch_size * patch_size)
 
-                # get patch of image
-                image_patch = image_texture[y : y + patch_size, x : x + patch_size]
+    @staticmethod
+    @jit(nopython=True, cache=True, nogil=True)
+    def apply_random_patches(
+        image_texture,
+        image_hsv_integral,
+        image_quilt,
+        default_ys,
+        default_xs,
+        candidate_ys,
+        candidate_xs,
+        patch_size,
+        overlap,
+        range_start,
+        range_end,
+        v_reference,
+    ):
+        """Paste patches of image texture into the quilt, where each patch is the first candidate patch with
+        hue, saturation and value within the reference range, or the default patch if none of them is valid.
+        Patches overlap and are pasted in order, so the loop is sequential.
 
-                # apply gamma correction
-                mid = np.mean(v_range) / 255
-                gamma = np.log(mid * 255) / np.log(v_mean)
-                image_patch = np.power(image_patch, gamma).clip(0, 255).astype(np.uint8)
-                break
+        :param image_texture: The input image texture.
+        :type image_texture: numpy array
+        :param image_hsv_integral: The integral image of the input image texture in HSV channel.
+        :type image_hsv_integral: numpy array
+        :param image_quilt: The output quilted image.
+        :type image_quilt: numpy array
+        :param default_ys: The y coordinates of default patch of each output patch.
+        :type default_ys: numpy array
+        :param default_xs: The x coordinates of default patch of each output patch.
+        :type default_xs: numpy array
+        :param candidate_ys: The y coordinates of candidate patches of each output patch.
+        :type candidate_ys: numpy array
+        :param candidate_xs: The x coordinates of candidate patches of each output patch.
+        :type candidate_xs: numpy array
+        :param patch_size: The size of each image patch.
+        :type patch_size: int
+        :param overlap: The overlapping size between patches.
+        :type overlap: int
+        :param range_start: The start of reference hue, saturation and value range.
+        :type range_start: numpy array
+        :param range_end: The end of reference hue, saturation and value range.
+        :type range_end: numpy array
+        :param v_reference: The reference value of value channel, used in gamma correction.
+        :type v_reference: float
+        """
 
-            n += 1
+        patch_number_height, patch_number_width, candidate_number = candidate_ys.shape
+        patch_area = patch_size * patch_size
+        gamma_table = np.empty(256, dtype=np.uint8)
 
-        return image_patch
+        for i in range(patch_number_height):
+            for j in range(patch_number_width):
+                y = default_ys[i, j]
+                x = default_xs[i, j]
+
+                # use the first candidate within the reference range
+                is_valid = False
+                for n in range(candidate_number):
+                    cy = candidate_ys[i, j, n]
+                    cx = candidate_xs[i, j, n]
+
+                    # get mean of h, s and v channel of current patch
+                    is_valid = True
+                    for c in range(3):
+                        patch_mean = (
+                            image_hsv_integral[cy + patch_size, cx + patch_size, c]
+                            - image_hsv_integral[cy, cx + patch_size, c]
+                            - image_hsv_integral[cy + patch_size, cx, c]
+                            + image_hsv_integral[cy, cx, c]
+                        ) / patch_area
+                        if patch_mean < range_start[c] or patch_mean >= range_end[c]:
+                            is_valid = False
+                            break
+
+                    if is_valid:
+                        y = cy
+                        x = cx
+                        # apply gamma correction with a lookup table of all uint8 values
+                        gamma = np.log(v_reference) / np.log(patch_mean)
+                        for value in range(256):
+                            gamma_table[value] = np.uint8(min(max(np.power(np.float64(value), gamma), 0.0), 255.0))
+                        break
+
+                # paste patch into the quilt
+                oy = i * (patch_size - overlap)
+                ox = j * (patch_size - overlap)
+                for py in range(patch_size):
+                    for px in range(patch_size):
+                        for c in range(image_texture.shape[2]):
+                            if is_valid:
+                                image_quilt[oy + py, ox + px, c] = gamma_table[image_texture[y + py, x + px, c]]
+                            else:
+                                image_quilt[oy + py, ox + px, c] = image_texture[y + py, x + px, c]
 
     def __call__(
         self,
@@ -1086,6 +1168,7 @@ class TextureGenerator:
         texture_height=1000,
         quilt_texture="random",
         quilt_size=(25, 40),
+        seed=None,
     ):
         """Main function to generate random textures.
 
@@ -1099,11 +1182,18 @@ class TextureGenerator:
         :type quilt_texture: int or string (optional)
         :param quilt_size: Tuple of ints in determining the size of texture patch in quilting process.
         :type quilt_size: tuple (optional)
+        :param seed: The seed of random generator, it is drawn from the global random state if None.
+        :type seed: int (optional)
         """
 
+        # reseed random generator from the global random state, so that textures follow the seed of the pipeline
+        if seed is None:
+            seed = np.random.randint(2**31)
+        self.rng = np.random.default_rng(seed)
+
         # check for image texture generation
         if texture_type == "random":
-            texture_type = random.choice(
+            texture_type = self.rng.choice(
                 [
                     "normal",
                     "strange",
@@ -1125,13 +1215,13 @@ class TextureGenerator:
                 texture_width,
                 texture_height,
                 1,
-                sigma=random.randint(3, 5),
-                turbulence=random.randint(3, 9),
+                sigma=int(self.rng.integers(3, 6)),
+                turbulence=int(self.rng.integers(3, 10)),
             )
         elif texture_type == "strange":
             image_texture = self.generate_strange_texture(texture_width, texture_height)
-            image_texture = cv2.cvtColor(np.uint8(image_texture * 255), cv2.COLOR_BGR2GRAY)
-            image_texture = cv2.resize(image_texture, (texture_width, texture_height), interpolation=cv2.INTER_LINEAR)
+            image_texture = np.uint8(image_texture * 255)
+            image_texture = self.resize_texture(image_texture, (texture_width, texture_height))
         elif texture_type == "rough_stains":
             image_texture = self.generate_rough_stains_texture(texture_width, texture_height)
         elif texture_type == "fine_stains":
@@ -1154,38 +1244,90 @@ class TextureGenerator:
             image_texture = self.generate_broken_edge_texture(texture_width, texture_height)
             # get mask of edge texture
             _, image_texture_binary = cv2.threshold(image_texture, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            # compute contours
-            contours, hierarchy = cv2.findContours(
-                image_texture_binary,
-                cv2.RETR_LIST,
-                cv2.CHAIN_APPROX_NONE,
+            # compute connected components of edge texture, label 0 is the zero valued pixels
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(
+                image_texture_binary, connectivity=8, ltype=cv2.CV_32S
+            )
+            # find the large inner component as edge texture
+            is_edge_texture = (
+                (stats[:, cv2.CC_STAT_AREA] > (texture_height * texture_width * 0.6))
+                & (stats[:, cv2.CC_STAT_WIDTH] != texture_width)
+                & (stats[:, cv2.CC_STAT_HEIGHT] != texture_height)
             )
-            # initialize mask of  edge texture
-            image_texture_mask = np.zeros_like(image_texture, dtype="uint8")
-            # find largest inner contour as edge texture
-            for contour in contours:
-                x0, y0, cwidth, cheight = cv2.boundingRect(contour)
-                area = cv2.contourArea(contour)
-                if (
-                    area > (texture_height * texture_width * 0.6)
-                    and cwidth != texture_width
-                    and cheight != texture_height
-                ):
-                    image_texture_mask = cv2.drawContours(image_texture_mask, [contour], -1, (255), cv2.FILLED)
-                    break
-            # remove area outside edge texture
-            image_texture[image_texture_mask <= 0] = 0
+            is_edge_texture[0] = False
+            if is_edge_texture.any():
+                # pad the component and flood fill the area outside it, so that holes in the edge texture are kept
+                image_component = np.zeros((labels.shape[0] + 2, labels.shape[1] + 2), dtype="uint8")
+                image_component[1:-1, 1:-1] = labels == np.argmax(is_edge_texture)
+                cv2.floodFill(image_component, None, (0, 0), 2)
+                # remove area outside edge texture
+                np.multiply(image_texture, image_component[1:-1, 1:-1] != 2, out=image_texture)
+            else:
+                image_texture[:] = 0
 
         # check for image quilting
         if quilt_texture == "random":
-            quilt_texture = random.choice([0, 1])
+            quilt_texture = self.rng.integers(0, 2)
 
         if quilt_texture:
-            patch_size = random.randint(quilt_size[0], quilt_size[1])
-            patch_number_width = int(texture_width / patch_size)
-            patch_number_height = int(texture_height / patch_size)
+            patch_size = int(self.rng.integers(quilt_size[0], quilt_size[1] + 1))
+            # number of overlapping patches to cover the output size, the overlap follows quilt_texture
+            patch_step = patch_size - patch_size // 5
+            patch_number_width = int(np.ceil(max(texture_width - patch_size, 0) / patch_step)) + 1
+            patch_number_height = int(np.ceil(max(texture_height - patch_size, 0) / patch_step)) + 1
             image_texture = self.quilt_texture(image_texture, patch_size, patch_number_width, patch_number_height)
-            # resize to output size
-            image_texture = cv2.resize(image_texture, (texture_width, texture_height), interpolation=cv2.INTER_LINEAR)
+            # crop to output size
+            image_texture = image_texture[:texture_height, :texture_width]
 
         return image_texture
+
+    def generate_batch(self, texture_specs, use_processes=0):
+        """Generate a batch of random textures in parallel threads or processes, one texture for each spec.
+        Scripts using processes must be guarded with if __name__ == "__main__".
+
+        :param texture_specs: List of dictionaries of the keyword arguments of texture generator, one for each texture.
+            For example, [{"texture_type": "rough_stains"}, {"texture_type": "normal", "texture_width": 500}].
+        :type texture_specs: list
+        :param use_processes: Flag to generate the textures in processes instead of threads.
+        :type use_processes: int (optional)
+        """
+
+        batch_size = len(texture_specs)
+        if batch_size == 0:
+            return []
+
+        # draw the seeds up front, so that the batch follows the global random state in both threads and processes
+        seeds = np.random.randint(2**31, size=batch_size).tolist()
+        max_workers = min(os.cpu_count() or 1, batch_size)
+
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        with executor:
+            # each texture is generated by a copy of the generator, so the threads do not share a random generator
+            futures = [
+                executor.submit(generate_seeded_texture, copy(self), seed, texture_spec)
+                for seed, texture_spec in zip(seeds, texture_specs)
+            ]
+
+        return [future.result() for future in futures]
+
+
+def generate_seeded_texture(texture_generator, seed, texture_spec):
+    """Generate a random texture with a seeded random generator, used by the thread and process pools of
+    TextureGenerator.generate_batch.
+
+    :param texture_generator: The texture generator.
+    :type texture_generator: TextureGenerator
+    :param seed: The seed of random generator.
+    :type seed: int
+    :param texture_spec: The keyword arguments of texture generator.
+    :type texture_spec: dict
+    """
+
+    # spawned processes unpickle the generator without running __init__, so restore its jit setting
+    config.DISABLE_JIT = bool(1 - texture_generator.numba_jit)
+
+    return texture_generator(seed=seed, **texture_spec)
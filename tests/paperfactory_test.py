@@ -0,0 +1,32 @@
+import os
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from augraphy import PaperFactory
+
+
+def test_retrieve_texture_drops_undecodable_file(tmp_path):
+    # OpenCV can't decode icon files, but their header passes the probe
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(tmp_path / "a.ico", sizes=[(64, 64)])
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(tmp_path / "b.png")
+
+    paper_factory = PaperFactory(texture_path=str(tmp_path), generate_texture=0)
+    image = np.full((50, 50, 3), 255, dtype=np.uint8)
+    for _ in range(20):
+        paper_factory.retrieve_texture(image, 0)
+
+    assert paper_factory.texture_file_names == ["b.png"]
+    assert [os.path.basename(file) for file in paper_factory.paper_texture_files] == ["b.png"]
+
+
+def test_load_textures_falls_back_to_opencv(tmp_path, monkeypatch):
+    # Pillow can't identify HDR images and refuses to open images above its pixel limit
+    cv2.imwrite(str(tmp_path / "a.hdr"), np.full((64, 64, 3), 0.5, dtype=np.float32))
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(tmp_path / "b.png")
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    paper_factory = PaperFactory(texture_path=str(tmp_path), generate_texture=0)
+
+    assert sorted(paper_factory.texture_file_names) == ["a.hdr", "b.png"]
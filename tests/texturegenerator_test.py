@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+
+from augraphy.utilities.texturegenerator import TextureGenerator
+
+
+def test_generate_batch_processes_after_texture():
+    texture_generator = TextureGenerator()
+
+    # run the Numba kernels in this process before starting the process pool
+    texture_generator(texture_type="rough_stains", texture_width=100, texture_height=100, quilt_texture=0)
+
+    texture_spec = {"texture_type": "rough_stains", "texture_width": 100, "texture_height": 100, "quilt_texture": 0}
+    textures = texture_generator.generate_batch([texture_spec] * 4, use_processes=1)
+
+    assert len(textures) == 4
+    assert all(texture.shape[:2] == (100, 100) and texture.dtype == np.uint8 for texture in textures)
+
+
+def test_generate_batch_threads(monkeypatch):
+    # force several worker threads, so the kernels are called concurrently even on a single core machine
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    texture_generator = TextureGenerator()
+
+    texture_spec = {"texture_type": "rough_stains", "texture_width": 100, "texture_height": 100, "quilt_texture": 0}
+    textures = texture_generator.generate_batch([texture_spec] * 16)
+
+    assert len(textures) == 16
+    assert all(texture.shape[:2] == (100, 100) and texture.dtype == np.uint8 for texture in textures)
+
+
+def test_generate_batch_empty():
+    texture_generator = TextureGenerator()
+
+    assert texture_generator.generate_batch([]) == []
+    assert texture_generator.generate_batch([], use_processes=1) == []
+
+
+def test_generate_batch_mixed_specs():
+    texture_generator = TextureGenerator()
+    texture_specs = [
+        {"texture_type": "normal", "texture_width": 60, "texture_height": 40, "quilt_texture": 0},
+        {"texture_type": "strange", "texture_width": 80, "texture_height": 50, "quilt_texture": 0},
+        {"texture_type": "rough_stains", "texture_width": 100, "texture_height": 70, "quilt_texture": 1},
+    ]
+
+    textures = texture_generator.generate_batch(texture_specs)
+
+    assert [texture.shape[:2] for texture in textures] == [(40, 60), (50, 80), (70, 100)]
+
+
+def test_generate_batch_threads_reproducible(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    texture_generator = TextureGenerator()
+    texture_specs = [{"texture_type": "random", "texture_width": 80, "texture_height": 80}] * 8
+
+    np.random.seed(0)
+    textures = texture_generator.generate_batch(texture_specs)
+    np.random.seed(0)
+    textures2 = texture_generator.generate_batch(texture_specs)
+
+    assert all(np.array_equal(texture, texture2) for texture, texture2 in zip(textures, textures2))
+
+
+def test_gaussian_blur_matches_opencv():
+    texture_generator = TextureGenerator()
+    image = np.random.default_rng(0).integers(0, 256, size=(300, 400), dtype=np.uint8)
+
+    for kernel_size in ((7, 7), (9, 9), (11, 11), (13, 13)):
+        image_blur = texture_generator.gaussian_blur(image, kernel_size).astype("int")
+        image_reference = cv2.GaussianBlur(image, kernel_size, 0).astype("int")
+        assert np.abs(image_blur - image_reference).max() <= 2